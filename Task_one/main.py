@@ -1,30 +1,237 @@
+import bisect
 import json
 import os
+import sys
 from datetime import datetime
-from typing import Dict, List, Optional
-from student import Student
+from typing import Dict, List, Optional, Tuple
+from student import (Student, SCORE_ADD, SCORE_UPDATE, SCORE_REMOVE, NAME_UPDATE,
+                     history_to_columns, history_from_columns)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rewrite the main file once the history log grows past this size
+LOG_COMPACT_BYTES = 1024 * 1024
+
+EQ50 = '=' * 50
+EQ60 = '=' * 60
+EQ80 = '=' * 80
+DASH30 = '-' * 30
+DASH80 = '-' * 80
+SUMMARY_HEADER = f"{'Name':<20} {'ID':<15} {'Subjects':<10} {'Average':<10} {'Grade':<8}\n"
+
+
+def _dump_json(data, path: str, durable: bool = False):
+    # Write to a temp file and swap it in, so a crash never leaves a half-written file
+    tmp = f"{path}.tmp"
+    if orjson is not None:
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+    else:
+        with open(tmp, 'w') as f:
+            json.dump(data, f, indent=2)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _load_json(path: str):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _encode_line(record) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record).encode() + b'\n'
+
+
+def _decode_line(line: bytes):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
 
 class StudentReportCardApp:
     
     def __init__(self, data_file: str = 'students_data.json'):
         self.data_file = data_file
+        # Score and name changes are appended here between full saves
+        self.log_file = f"{data_file}.log"
+        self._log_fp = None
+        self._log_pending = False
+        # Sequence number of the last logged change; the main file stores the last one it includes
+        self._log_seq = 0
+        # Version history lives in its own file and is only read when first needed
+        root, ext = os.path.splitext(data_file)
+        self.history_file = f"{root}_history{ext}"
+        self._history_table: Optional[dict] = None
+        self._history_seq = 0
+        self._history_stale = False
         self.students = {}
+        self._next_id = 1
+        self._name_index: Dict[str, List[str]] = {}
+        # (name, student_id) pairs kept in listing order
+        self._sorted_names: List[Tuple[str, str]] = []
+        self._dirty = False
+        self._commands = {
+            'help': self.show_help,
+            'add': self._cmd_add,
+            'score': self._cmd_score,
+            'view': self._cmd_view,
+            'list': self.view_all_students,
+            'history': self._cmd_history,
+            'update': self._cmd_update,
+            'remove': self._cmd_remove,
+            'save': self._cmd_save,
+            'compact': self.compact,
+        }
         self.load_data()
     
-    def save_data(self):
+    def _index_name(self, student: Student):
+        self._name_index.setdefault(student.name.lower(), []).append(student.student_id)
+        bisect.insort(self._sorted_names, (student.name, student.student_id))
+    
+    def _unindex_name(self, student: Student):
+        key = student.name.lower()
+        ids = self._name_index.get(key)
+        if ids and student.student_id in ids:
+            ids.remove(student.student_id)
+            if not ids:
+                del self._name_index[key]
+        
+        entry = (student.name, student.student_id)
+        pos = bisect.bisect_left(self._sorted_names, entry)
+        if pos < len(self._sorted_names) and self._sorted_names[pos] == entry:
+            del self._sorted_names[pos]
+    
+    def _log_event(self, student: Student):
+        if self._log_fp is None:
+            self._log_fp = open(self.log_file, 'a+b')
+            if self._log_fp.tell():
+                # A crash can leave a torn last line; start on a fresh line so the
+                # next record is not glued onto it and skipped on replay
+                self._log_fp.seek(-1, os.SEEK_END)
+                if self._log_fp.read(1) != b'\n':
+                    self._log_fp.write(b'\n')
+        
+        self._log_seq += 1
+        record = {'seq': self._log_seq, 'sid': student.student_id, 'entry': student.version_history[-1]}
+        self._log_fp.write(_encode_line(record))
+        self._log_fp.flush()
+        self._log_pending = True
+        
+        if self._log_fp.tell() >= LOG_COMPACT_BYTES:
+            self.compact()
+    
+    def _replay_log(self, applied_seq: int) -> int:
+        if not os.path.exists(self.log_file):
+            return 0
+        
+        replayed = 0
+        with open(self.log_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = _decode_line(line)
+                except ValueError:
+                    # A crash mid-write can leave a torn last line
+                    continue
+                seq = record['seq']
+                self._log_seq = max(self._log_seq, seq)
+                student = self.students.get(record['sid'])
+                if seq <= applied_seq:
+                    # Saved into the main file before the log could be truncated; the
+                    # history file is written second and may still be missing it
+                    if student and seq > self._get_history_seq():
+                        student.version_history.append(tuple(record['entry']))
+                    continue
+                if student:
+                    student.replay(record['entry'])
+                    replayed += 1
+        return replayed
+    
+    def _truncate_log(self):
+        if self._log_fp is not None:
+            self._log_fp.close()
+            self._log_fp = None
+        if os.path.exists(self.log_file):
+            os.remove(self.log_file)
+        self._log_pending = False
+    
+    def _get_history_table(self) -> dict:
+        if self._history_table is None:
+            data = _load_json(self.history_file) if os.path.exists(self.history_file) else {}
+            if 'log_seq' not in data:
+                # Earlier history files are a bare sid -> columns table
+                data = {'students': data}
+            self._history_table = data.get('students', {})
+            self._history_seq = data.get('log_seq', 0)
+        return self._history_table
+    
+    def _get_history_seq(self) -> int:
+        self._get_history_table()
+        return self._history_seq
+    
+    def _load_history(self, sid: str) -> list:
+        columns = self._get_history_table().get(sid)
+        return history_from_columns(columns) if columns else []
+    
+    def _save_history(self, durable: bool):
+        students = self.students.values()
+        if not self._history_stale and not any(s.history_loaded and s.version_history for s in students):
+            return
+        
+        table = self._get_history_table()
+        history = {}
+        for sid, student in self.students.items():
+            if student.history_loaded:
+                if student.version_history:
+                    history[sid] = history_to_columns(student.version_history)
+            elif sid in table:
+                history[sid] = table[sid]
+        
+        _dump_json({'log_seq': self._log_seq, 'students': history}, self.history_file, durable)
+        self._history_table = history
+        self._history_seq = self._log_seq
+        self._history_stale = False
+    
+    def compact(self):
+        self._dirty = True
+        self.save_data(durable=True)
+    
+    def save_data(self, durable: bool = False):
+        if not self._dirty:
+            if self._log_pending:
+                # Score and name changes are already on disk in the history log
+                if durable:
+                    os.fsync(self._log_fp.fileno())
+                self._log_pending = False
+                print(f"✅ Changes recorded in {self.log_file}")
+            else:
+                print("💾 No changes to save")
+            return
+        
         try:
             data = {
-                'students': {sid: student.to_dict() for sid, student in self.students.items()},
+                'students': {sid: student.to_dict(include_history=False)
+                             for sid, student in self.students.items()},
+                'log_seq': self._log_seq,
                 'last_backup': datetime.now().isoformat()
             }
             
-            # Create backup of existing file
-            if os.path.exists(self.data_file):
-                backup_file = f"{self.data_file}.backup"
-                os.rename(self.data_file, backup_file)
-            
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Main file first: log records it includes are only skipped on replay once it is written
+            _dump_json(data, self.data_file, durable)
+            self._save_history(durable)
+            self._truncate_log()
+            self._dirty = False
             
             print(f"✅ Data saved successfully to {self.data_file}")
             
@@ -34,14 +241,30 @@ class StudentReportCardApp:
     def load_data(self):
         try:
             if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
+                data = _load_json(self.data_file)
                 
                 student_data = data.get('students', {})
                 for sid, sdata in student_data.items():
-                    self.students[sid] = Student.from_dict(sdata)
+                    student = Student.from_dict(sdata)
+                    if 'version_history' not in sdata:
+                        student.defer_history(lambda sid=sid: self._load_history(sid))
+                    self.students[sid] = student
+                
+                applied_seq = data.get('log_seq', 0)
+                self._log_seq = applied_seq
+                replayed = self._replay_log(applied_seq)
+                
+                # Older files use timestamp ids like STU20240101120000; only numeric ids seed the counter
+                self._next_id = max((int(sid) for sid in self.students if sid.isdigit()), default=0) + 1
+                
+                self._name_index = {}
+                for student in self.students.values():
+                    self._name_index.setdefault(student.name.lower(), []).append(student.student_id)
+                self._sorted_names = sorted((s.name, sid) for sid, s in self.students.items())
                 
                 print(f"✅ Loaded {len(self.students)} students from {self.data_file}")
+                if replayed:
+                    print(f"✅ Replayed {replayed} changes from {self.log_file}")
             else:
                 print(f"📁 No existing data file found. Starting fresh.")
                 
@@ -50,8 +273,11 @@ class StudentReportCardApp:
             print("Starting with empty database.")
     
     def add_student(self, name: str) -> str:
-        student = Student(name)
+        student = Student(name, str(self._next_id))
+        self._next_id += 1
         self.students[student.student_id] = student
+        self._index_name(student)
+        self._dirty = True
         print(f"✅ Added student: {name} (ID: {student.student_id})")
         return student.student_id
     
@@ -61,9 +287,9 @@ class StudentReportCardApp:
             return self.students[identifier]
         
         # Then find by name
-        for student in self.students.values():
-            if student.name.lower() == identifier.lower():
-                return student
+        ids = self._name_index.get(identifier.lower())
+        if ids:
+            return self.students.get(ids[0])
         
         return None
     
@@ -75,6 +301,7 @@ class StudentReportCardApp:
         
         try:
             student.add_subject_score(subject, score)
+            self._log_event(student)
             print(f"✅ Added {subject}: {score} for {student.name}")
         except ValueError as e:
             print(f"❌ Error: {e}")
@@ -85,47 +312,48 @@ class StudentReportCardApp:
             print(f"❌ Student '{student_identifier}' not found")
             return
         
-        print(f"\n{'='*50}")
+        print(f"\n{EQ50}")
         print(f"📊 STUDENT REPORT CARD")
-        print(f"{'='*50}")
+        print(EQ50)
         print(f"Name: {student.name}")
         print(f"ID: {student.student_id}")
         print(f"Created: {student.created_at}")
         print(f"Last Updated: {student.last_updated}")
         print(f"\n📚 SUBJECTS & SCORES:")
-        print(f"{'-'*30}")
+        print(DASH30)
         
         if student.subjects:
             for subject, score in student.subjects.items():
                 print(f"{subject:<20} {score:>6.1f}")
             
-            print(f"{'-'*30}")
+            print(DASH30)
             print(f"{'Average':<20} {student.calculate_average():>6.1f}")
             print(f"{'Letter Grade':<20} {student.get_letter_grade():>6}")
         else:
             print("No subjects recorded yet.")
         
-        print(f"{'='*50}\n")
+        print(f"{EQ50}\n")
     
     def view_all_students(self):
         if not self.students:
             print("📂 No students in database")
             return
         
-        print(f"\n{'='*80}")
-        print(f"📊 ALL STUDENTS SUMMARY")
-        print(f"{'='*80}")
-        print(f"{'Name':<20} {'ID':<15} {'Subjects':<10} {'Average':<10} {'Grade':<8}")
-        print(f"{'-'*80}")
-        
-        for student in sorted(self.students.values(), key=lambda x: x.name):
-            avg = student.calculate_average()
-            grade = student.get_letter_grade()
-            subject_count = len(student.subjects)
-            
-            print(f"{student.name:<20} {student.student_id:<15} {subject_count:<10} {avg:<10.1f} {grade:<8}")
-        
-        print(f"{'='*80}\n")
+        # Build the whole report and write it once instead of one print per row
+        lines = [
+            f"\n{EQ80}\n",
+            f"📊 ALL STUDENTS SUMMARY\n",
+            f"{EQ80}\n",
+            SUMMARY_HEADER,
+            f"{DASH80}\n",
+        ]
+        lines.extend(
+            f"{student.name:<20} {student.student_id:<15} {len(student.subjects):<10} "
+            f"{student.calculate_average():<10.1f} {student.get_letter_grade():<8}\n"
+            for student in (self.students[sid] for _, sid in self._sorted_names)
+        )
+        lines.append(f"{EQ80}\n\n")
+        sys.stdout.write(''.join(lines))
     
     def view_version_history(self, student_identifier: str):
         student = self.find_student(student_identifier)
@@ -137,27 +365,23 @@ class StudentReportCardApp:
             print(f"📜 No version history for {student.name}")
             return
         
-        print(f"\n{'='*60}")
+        print(f"\n{EQ60}")
         print(f"📜 VERSION HISTORY: {student.name}")
-        print(f"{'='*60}")
+        print(EQ60)
         
-        for i, entry in enumerate(reversed(student.version_history), 1):
-            timestamp = entry['timestamp']
-            action = entry['action']
-            subject = entry['subject']
-            old_score = entry.get('old_score')
-            new_score = entry.get('new_score')
-            
-            print(f"{i}. {timestamp}")
-            if action == 'score_add':
-                print(f"   ➕ Added {subject}: {new_score}")
-            elif action == 'score_update':
-                print(f"   ✏️  Updated {subject}: {old_score} → {new_score}")
-            elif action == 'score_remove':
-                print(f"   ❌ Removed {subject} (was: {old_score})")
+        for i, (ts, action, subject, old, new) in enumerate(reversed(student.version_history), 1):
+            print(f"{i}. {datetime.fromtimestamp(ts).isoformat()}")
+            if action == SCORE_ADD:
+                print(f"   ➕ Added {subject}: {new}")
+            elif action == SCORE_UPDATE:
+                print(f"   ✏️  Updated {subject}: {old} → {new}")
+            elif action == SCORE_REMOVE:
+                print(f"   ❌ Removed {subject} (was: {old})")
+            elif action == NAME_UPDATE:
+                print(f"   🏷️  Renamed: {old} → {new}")
             print()
         
-        print(f"{'='*60}\n")
+        print(f"{EQ60}\n")
     
     def update_student_name(self, student_identifier: str, new_name: str):
         student = self.find_student(student_identifier)
@@ -166,15 +390,10 @@ class StudentReportCardApp:
             return
         
         old_name = student.name
-        student.name = new_name
-        student.last_updated = datetime.now().isoformat()
-        
-        student.version_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'action': 'name_update',
-            'old_name': old_name,
-            'new_name': new_name
-        })
+        self._unindex_name(student)
+        student.update_name(new_name)
+        self._index_name(student)
+        self._log_event(student)
         
         print(f"✅ Updated student name: {old_name} → {new_name}")
     
@@ -187,10 +406,65 @@ class StudentReportCardApp:
         confirm = input(f"⚠️  Are you sure you want to remove {student.name}? (y/N): ").lower()
         if confirm == 'y':
             del self.students[student.student_id]
+            self._unindex_name(student)
+            self._history_stale = True
+            self._dirty = True
             print(f"✅ Removed student: {student.name}")
         else:
             print("❌ Operation cancelled")
     
+    def show_help(self):
+        print("\n📋 Available commands:")
+        print("  add      - Add a new student")
+        print("  score    - Add or update a subject score")
+        print("  view     - View a student's report card")
+        print("  list     - List all students")
+        print("  history  - View a student's version history")
+        print("  update   - Update a student's name")
+        print("  remove   - Remove a student")
+        print("  save     - Save data to disk")
+        print("  compact  - Fold the change log into the data file")
+        print("  quit     - Save and exit\n")
+    
+    def _cmd_add(self):
+        name = input("Enter student name: ").strip()
+        if name:
+            self.add_student(name)
+        else:
+            print("❌ Name cannot be empty")
+    
+    def _cmd_score(self):
+        student_id = input("Enter student name or ID: ").strip()
+        subject = input("Enter subject: ").strip()
+        try:
+            score = float(input("Enter score (0-100): "))
+            self.add_score(student_id, subject, score)
+        except ValueError:
+            print("❌ Invalid score. Please enter a number.")
+    
+    def _cmd_view(self):
+        student_id = input("Enter student name or ID: ").strip()
+        self.view_student(student_id)
+    
+    def _cmd_history(self):
+        student_id = input("Enter student name or ID: ").strip()
+        self.view_version_history(student_id)
+    
+    def _cmd_update(self):
+        student_id = input("Enter student name or ID: ").strip()
+        new_name = input("Enter new name: ").strip()
+        if new_name:
+            self.update_student_name(student_id, new_name)
+        else:
+            print("❌ Name cannot be empty")
+    
+    def _cmd_remove(self):
+        student_id = input("Enter student name or ID: ").strip()
+        self.remove_student(student_id)
+    
+    def _cmd_save(self):
+        self.save_data(durable=True)
+    
     def run(self):
         print("🎓 Welcome to Student Report Card Manager!")
         print("Type 'help' for available commands or 'quit' to exit.\n")
@@ -200,61 +474,19 @@ class StudentReportCardApp:
                 command = input("📝 Enter command: ").strip().lower()
                 
                 if command == 'quit' or command == 'exit':
-                    self.save_data()
+                    self.save_data(durable=True)
                     print("👋 Goodbye!")
                     break
                 
-                elif command == 'help':
-                    self.show_help()
-                
-                elif command == 'add':
-                    name = input("Enter student name: ").strip()
-                    if name:
-                        self.add_student(name)
-                    else:
-                        print("❌ Name cannot be empty")
-                
-                elif command == 'score':
-                    student_id = input("Enter student name or ID: ").strip()
-                    subject = input("Enter subject: ").strip()
-                    try:
-                        score = float(input("Enter score (0-100): "))
-                        self.add_score(student_id, subject, score)
-                    except ValueError:
-                        print("❌ Invalid score. Please enter a number.")
-                
-                elif command == 'view':
-                    student_id = input("Enter student name or ID: ").strip()
-                    self.view_student(student_id)
-                
-                elif command == 'list':
-                    self.view_all_students()
-                
-                elif command == 'history':
-                    student_id = input("Enter student name or ID: ").strip()
-                    self.view_version_history(student_id)
-                
-                elif command == 'update':
-                    student_id = input("Enter student name or ID: ").strip()
-                    new_name = input("Enter new name: ").strip()
-                    if new_name:
-                        self.update_student_name(student_id, new_name)
-                    else:
-                        print("❌ Name cannot be empty")
-                
-                elif command == 'remove':
-                    student_id = input("Enter student name or ID: ").strip()
-                    self.remove_student(student_id)
-                
-                elif command == 'save':
-                    self.save_data()
-                
+                handler = self._commands.get(command)
+                if handler:
+                    handler()
                 else:
                     print("❌ Unknown command. Type 'help' for available commands.")
                 
             except KeyboardInterrupt:
                 print("\n\n⚠️  Interrupted by user")
-                self.save_data()
+                self.save_data(durable=True)
                 break
             except Exception as e:
                 print(f"❌ An error occurred: {e}")
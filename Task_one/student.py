@@ -1,49 +1,136 @@
+import math
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, List, Optional
+
+# version_history entries are (timestamp, action, subject, old, new) tuples with
+# epoch-second timestamps and the action stored as an index into ACTIONS
+ACTIONS = ('score_add', 'score_update', 'score_remove', 'name_update')
+SCORE_ADD, SCORE_UPDATE, SCORE_REMOVE, NAME_UPDATE = range(len(ACTIONS))
+HISTORY_COLUMNS = ('ts', 'action', 'subject', 'old', 'new')
+
+
+def history_to_columns(history: List[tuple]) -> dict:
+    columns = list(zip(*history)) or [()] * len(HISTORY_COLUMNS)
+    return {name: list(values) for name, values in zip(HISTORY_COLUMNS, columns)}
+
+
+def history_from_columns(data) -> List[tuple]:
+    if isinstance(data, dict):
+        return list(zip(*(data[name] for name in HISTORY_COLUMNS)))
+    
+    # Older files store one dict per entry with ISO timestamps
+    history = []
+    for entry in data:
+        ts = datetime.fromisoformat(entry['timestamp']).timestamp()
+        action = ACTIONS.index(entry['action'])
+        if action == NAME_UPDATE:
+            history.append((ts, action, None, entry.get('old_name'), entry.get('new_name')))
+        else:
+            history.append((ts, action, entry.get('subject'), entry.get('old_score'), entry.get('new_score')))
+    return history
 
 class Student:
     def __init__(self, name: str, student_id: Optional[str] = None):
+        now = datetime.now()
         self.name = name
-        self.student_id = student_id or f"STU{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self.student_id = student_id or f"STU{now.strftime('%Y%m%d%H%M%S')}"
         self.subjects = {}
-        self.version_history = []
-        self.created_at = datetime.now().isoformat()
-        self.last_updated = datetime.now().isoformat()
+        self._history: Optional[List[tuple]] = []
+        self._history_loader: Optional[Callable[[], List[tuple]]] = None
+        self._score_sum = 0.0
+        self._score_count = 0
+        self.created_at = self.last_updated = now.isoformat()
+    
+    @property
+    def version_history(self) -> List[tuple]:
+        if self._history is None:
+            self._history = self._history_loader() if self._history_loader else []
+            self._history_loader = None
+        return self._history
+    
+    @version_history.setter
+    def version_history(self, history: List[tuple]):
+        self._history = history
+        self._history_loader = None
+    
+    @property
+    def history_loaded(self) -> bool:
+        return self._history is not None
+    
+    def defer_history(self, loader: Callable[[], List[tuple]]):
+        """Load version history through loader on first access"""
+        self._history = None
+        self._history_loader = loader
     
     def add_subject_score(self, subject: str, score: float):
         if not (0 <= score <= 100):
             raise ValueError("Score must be between 0 and 100")
         
-        old_score = self.subjects.get(subject)
-        self.subjects[subject] = score
+        old_score = self._set_score(subject, score)
         
         # Record version history
-        self.version_history.append({
-            'timestamp': datetime.now().isoformat(),
-            'action': 'score_update' if old_score is not None else 'score_add',
-            'subject': subject,
-            'old_score': old_score,
-            'new_score': score
-        })
+        now = time.time()
+        action = SCORE_UPDATE if old_score is not None else SCORE_ADD
+        self.version_history.append((now, action, subject, old_score, score))
         
-        self.last_updated = datetime.now().isoformat()
+        self.last_updated = datetime.fromtimestamp(now).isoformat()
     
     def remove_subject(self, subject: str):
         if subject in self.subjects:
-            old_score = self.subjects.pop(subject)
-            self.version_history.append({
-                'timestamp': datetime.now().isoformat(),
-                'action': 'score_remove',
-                'subject': subject,
-                'old_score': old_score,
-                'new_score': None
-            })
-            self.last_updated = datetime.now().isoformat()
+            old_score = self._pop_score(subject)
+            now = time.time()
+            self.version_history.append((now, SCORE_REMOVE, subject, old_score, None))
+            self.last_updated = datetime.fromtimestamp(now).isoformat()
+    
+    def update_name(self, new_name: str):
+        now = time.time()
+        self.version_history.append((now, NAME_UPDATE, None, self.name, new_name))
+        self.name = new_name
+        self.last_updated = datetime.fromtimestamp(now).isoformat()
+    
+    def _set_score(self, subject: str, score: float) -> Optional[float]:
+        old_score = self.subjects.get(subject)
+        self.subjects[subject] = score
+        self._update_totals()
+        return old_score
+    
+    def _pop_score(self, subject: str) -> float:
+        old_score = self.subjects.pop(subject)
+        self._update_totals()
+        return old_score
+    
+    def _update_totals(self):
+        # fsum is exact, so the average does not depend on edit order or on a reload
+        self._score_sum = math.fsum(self.subjects.values())
+        self._score_count = len(self.subjects)
+    
+    def replay(self, entry):
+        """Re-apply a logged history entry"""
+        ts, action, subject, old, new = entry
+        if action == NAME_UPDATE:
+            self.name = new
+        elif action == SCORE_REMOVE:
+            if subject in self.subjects:
+                self._pop_score(subject)
+        else:
+            self._set_score(subject, new)
+        
+        self.version_history.append((ts, action, subject, old, new))
+        self.last_updated = datetime.fromtimestamp(ts).isoformat()
     
     def calculate_average(self) -> float:
-        if not self.subjects:
+        """Average of the current scores
+        
+        >>> s = Student('Ann', '1')
+        >>> for subject, score in [('s0', 90.3), ('s1', 65.1), ('s1', 77.8), ('s0', 57.5), ('s0', 82.2)]:
+        ...     s.add_subject_score(subject, score)
+        >>> s.calculate_average(), s.get_grade()
+        (80.0, 'B')
+        """
+        if not self._score_count:
             return 0.0
-        return sum(self.subjects.values()) / len(self.subjects)
+        return self._score_sum / self._score_count
     
     def get_grade(self) -> str:
         avg = self.calculate_average()
@@ -58,23 +145,29 @@ class Student:
         else:
             return 'F'
     
-    def to_dict(self) -> dict:
-        return {
+    get_letter_grade = get_grade
+    
+    def to_dict(self, include_history: bool = True) -> dict:
+        data = {
             'name': self.name,
             'student_id': self.student_id,
             'subjects': self.subjects,
-            'version_history': self.version_history,
             'created_at': self.created_at,
             'last_updated': self.last_updated
         }
+        if include_history:
+            data['version_history'] = history_to_columns(self.version_history)
+        return data
     
     @classmethod
     def from_dict(cls, data: dict):
         """Create student from dictionary"""
         student = cls(data['name'], data.get('student_id'))
         student.subjects = data.get('subjects', {})
-        student.version_history = data.get('version_history', [])
-        student.created_at = data.get('created_at', datetime.now().isoformat())
-        student.last_updated = data.get('last_updated', datetime.now().isoformat())
+        student._update_totals()
+        if 'version_history' in data:
+            student.version_history = history_from_columns(data['version_history'])
+        student.created_at = data.get('created_at', student.created_at)
+        student.last_updated = data.get('last_updated', student.last_updated)
         return student
 
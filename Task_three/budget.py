@@ -1,7 +1,15 @@
-from typing import List, Dict
+from collections import defaultdict
+from typing import List, Dict, Tuple
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class Transaction:
+    __slots__ = ('date', 'category', 'amount')
+
     def __init__(self, date: str, category: str, amount: float):
         self.date = date
         self.category = category
@@ -19,21 +27,41 @@ class Transaction:
         return cls(data['date'], data['category'], data['amount'])
 
 def group_by_category(transactions: List[Transaction]) -> Dict[str, List[Transaction]]:
-    grouped = {}
+    grouped = defaultdict(list)
     for transaction in transactions:
-        if transaction.category not in grouped:
-            grouped[transaction.category] = []
         grouped[transaction.category].append(transaction)
     return grouped
 
 def calculate_totals(transactions: List[Transaction]) -> Dict[str, float]:
-    totals = {}
+    totals = defaultdict(float)
     for transaction in transactions:
-        if transaction.category not in totals:
-            totals[transaction.category] = 0
         totals[transaction.category] += transaction.amount
     return totals
 
-def calculate_grand_total(transactions: List[Transaction]) -> float:
-    return sum(transaction.amount for transaction in transactions)
+def group_and_total(transactions: List[Transaction]) -> Tuple[Dict[str, List[Transaction]], Dict[str, float]]:
+    grouped = defaultdict(list)
+    totals = defaultdict(float)
+    for transaction in transactions:
+        category = transaction.category
+        grouped[category].append(transaction)
+        totals[category] += transaction.amount
+    return grouped, totals
 
+def encode_category(category: str, category_codes: Dict[str, int]) -> int:
+    code = category_codes.get(category)
+    if code is None:
+        code = category_codes[category] = len(category_codes)
+    return code
+
+def to_columns(transactions: List[Transaction], codes: List[int]):
+    amounts = np.fromiter((transaction.amount for transaction in transactions),
+                          dtype=np.float64, count=len(transactions))
+    return np.array(codes, dtype=np.intp), amounts
+
+def calculate_totals_columnar(codes, amounts, category_codes: Dict[str, int]) -> Dict[str, float]:
+    # Codes are handed out in first-seen order, so they line up with category_codes
+    sums = np.bincount(codes, weights=amounts, minlength=len(category_codes))
+    return dict(zip(category_codes, sums.tolist()))
+
+def calculate_grand_total(transactions: List[Transaction]) -> float:
+    return sum([transaction.amount for transaction in transactions])
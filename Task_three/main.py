@@ -1,20 +1,71 @@
 import json
 import os
 from datetime import datetime
-from budget import Transaction, group_by_category, calculate_totals, calculate_grand_total
+from budget import (Transaction, group_and_total, calculate_totals, calculate_grand_total,
+                    encode_category, to_columns, calculate_totals_columnar, np)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # ijson picks its fastest available backend (yajl2_c) on import
+    import ijson
+except ImportError:
+    ijson = None
+
+# Below this many rows the NumPy conversion costs more than it saves
+COLUMNAR_MIN_ROWS = 10_000
+
+
+def _dump_json(data, path: str):
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+
+def _load_json(path: str):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
 
 class BudgetTracker:
     def __init__(self, data_file: str = 'expenses.json'):
         self.data_file = data_file
         self.transactions = []
+        # Dense integer code per category, plus one code per transaction
+        self._category_codes = {}
+        self._codes = []
+        self._columns = None
+        self._dirty = False
+        self._commands = {
+            'add': self.add_transaction,
+            'category': self.view_by_category,
+            'totals': self.view_totals,
+            'save': self.save_data,
+        }
         self.load_data()
     
     def load_data(self):
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                self.transactions = [Transaction.from_dict(t) for t in data]
+                if ijson is not None:
+                    with open(self.data_file, 'rb') as f:
+                        items = ijson.items(f, 'item', use_float=True)
+                        self.transactions = [Transaction.from_dict(t) for t in items]
+                else:
+                    data = _load_json(self.data_file)
+                    self.transactions = [Transaction.from_dict(t) for t in data]
+                self._category_codes = {}
+                self._codes = [encode_category(t.category, self._category_codes)
+                               for t in self.transactions]
+                self._columns = None
                 print(f"Loaded {len(self.transactions)} transactions")
             except Exception as e:
                 print(f"Error loading data: {e}")
@@ -22,10 +73,14 @@ class BudgetTracker:
             print("No existing data file found")
     
     def save_data(self):
+        if not self._dirty:
+            print("No changes to save")
+            return
+        
         try:
             data = [transaction.to_dict() for transaction in self.transactions]
-            with open(self.data_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            _dump_json(data, self.data_file)
+            self._dirty = False
             print("Data saved successfully")
         except Exception as e:
             print(f"Error saving data: {e}")
@@ -47,6 +102,9 @@ class BudgetTracker:
             
             transaction = Transaction(date, category, amount)
             self.transactions.append(transaction)
+            self._codes.append(encode_category(category, self._category_codes))
+            self._columns = None
+            self._dirty = True
             print(f"Added transaction: {date} - {category} - ${amount:.2f}")
             
         except ValueError:
@@ -59,8 +117,7 @@ class BudgetTracker:
             print("No transactions found")
             return
         
-        grouped = group_by_category(self.transactions)
-        totals = calculate_totals(self.transactions)
+        grouped, totals = group_and_total(self.transactions)
         
         print("\n=== EXPENSES BY CATEGORY ===")
         for category, transactions in grouped.items():
@@ -74,8 +131,15 @@ class BudgetTracker:
             print("No transactions found")
             return
         
-        totals = calculate_totals(self.transactions)
-        grand_total = calculate_grand_total(self.transactions)
+        if np is not None and len(self.transactions) >= COLUMNAR_MIN_ROWS:
+            if self._columns is None:
+                self._columns = to_columns(self.transactions, self._codes)
+            codes, amounts = self._columns
+            totals = calculate_totals_columnar(codes, amounts, self._category_codes)
+            grand_total = float(amounts.sum())
+        else:
+            totals = calculate_totals(self.transactions)
+            grand_total = calculate_grand_total(self.transactions)
         
         print("\n=== CATEGORY TOTALS ===")
         for category, total in totals.items():
@@ -93,14 +157,10 @@ class BudgetTracker:
             if command == 'quit':
                 self.save_data()
                 break
-            elif command == 'add':
-                self.add_transaction()
-            elif command == 'category':
-                self.view_by_category()
-            elif command == 'totals':
-                self.view_totals()
-            elif command == 'save':
-                self.save_data()
+            
+            handler = self._commands.get(command)
+            if handler:
+                handler()
             else:
                 print("Unknown command. Use: add, category, totals, save, quit")
 
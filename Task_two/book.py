@@ -1,12 +1,12 @@
-import math
 from typing import Dict, Any
 
 class Book:
+    __slots__ = ('title', 'author', 'price', 'stock')
     
     def __init__(self, title: str, author: str, price: float, stock: int = 0):
         self.title = title.strip()
         self.author = author.strip()
-        self.price = math.ceil(price * 100) / 100 
+        self.price = round(float(price), 2) 
         self.stock = max(0, stock)  
     
     def update_stock(self, quantity: int) -> bool:
@@ -17,10 +17,10 @@ class Book:
         return True
     
     def update_price(self, new_price: float):
-        self.price = math.ceil(new_price * 100) / 100
+        self.price = round(float(new_price), 2)
     
     def calculate_value(self) -> float:
-        return math.ceil(self.price * self.stock * 100) / 100
+        return round(self.price * self.stock, 2)
     
     def is_in_stock(self) -> bool:
         return self.stock > 0
@@ -1,36 +1,300 @@
 import json
-import os
 import math
-from typing import Dict, List, Optional, Tuple
+import operator
+import os
+import sys
+import time
+from array import array
+from collections import defaultdict, deque
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 from book import Book
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+# Older log entries are moved to the .log.jsonl archive on save
+MAX_LOG_ENTRIES = 10_000
+
+# Rows encoded per call when streaming columns to disk, and the file buffer they go through
+SAVE_CHUNK_ROWS = 10_000
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Inventory files with this suffix are stored as a zstd frame around the JSON;
+# when zstandard is installed, saves go to the .zst sibling of json_file
+ZSTD_SUFFIX = '.zst'
+ZSTD_LEVEL = 3
+
+# Detail lines for view_transaction_log, filled from each entry's details dict
+LOG_DETAIL_FORMATS = {
+    'ADD_BOOK': "   Added: '{title}' by {author}\n   Price: ${price:.2f}, Initial Stock: {initial_stock}",
+    'STOCK_UPDATE': "   Stock: {old_stock} → {new_stock} ({change:+d})\n   Reason: {reason}",
+    'PRICE_UPDATE': "   Price: ${old_price:.2f} → ${new_price:.2f}",
+    'REMOVE_BOOK': "   Removed: '{title}'",
+}
+
+
+def _require_zstd():
+    if zstd is None:
+        raise RuntimeError(f"zstandard is required for {ZSTD_SUFFIX} inventory files")
+    return zstd
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        # orjson serializes datetime natively
+        return orjson.dumps(value)
+    return json.dumps(value, default=datetime.isoformat).encode()
+
+
+def _write_array(f, items):
+    # Encode one chunk of rows at a time and splice the chunks into a single JSON array
+    f.write(b'[')
+    items = iter(items)
+    chunk = list(islice(items, SAVE_CHUNK_ROWS))
+    first = True
+    while chunk:
+        if not first:
+            f.write(b',')
+        f.write(_dumps(chunk)[1:-1])
+        first = False
+        chunk = list(islice(items, SAVE_CHUNK_ROWS))
+    f.write(b']')
+
+
+def _stream_json(path: str, columns: Dict[str, Any], fields: Dict[str, Any], durable: bool = False):
+    # Write to a temp file and swap it in, so a crash never leaves a half-written file.
+    # Columns are streamed in chunks, so the full document is never held in memory
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb', buffering=WRITE_BUFFER_BYTES) as raw:
+        if path.endswith(ZSTD_SUFFIX):
+            f = _require_zstd().ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw, closefd=False)
+        else:
+            f = raw
+        sep = b'{'
+        for key, items in columns.items():
+            f.write(sep + _dumps(key) + b':')
+            _write_array(f, items)
+            sep = b','
+        for key, value in fields.items():
+            f.write(sep + _dumps(key) + b':' + _dumps(value))
+            sep = b','
+        f.write(b'}')
+        if f is not raw:
+            # Ends the zstd frame; the underlying file stays open for the fsync below
+            f.close()
+        if durable:
+            raw.flush()
+            os.fsync(raw.fileno())
+    os.replace(tmp, path)
+
+
+def _encode_line(record) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return json.dumps(record, default=datetime.isoformat).encode() + b'\n'
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# Checked once: piped/scripted input skips the prompt text and reads straight from the stream
+INTERACTIVE = sys.stdin is not None and sys.stdin.isatty()
+
+
+def _prompt(text: str) -> str:
+    if INTERACTIVE:
+        return input(text)
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+def _log_timestamp(entry: Dict[str, Any]) -> str:
+    # New entries keep raw nanoseconds in memory; entries loaded from disk carry the ISO string
+    ts_ns = entry.get('ts_ns')
+    if ts_ns is None:
+        return entry['timestamp']
+    return datetime.fromtimestamp(ts_ns / 1e9).isoformat()
+
+
+def _stored_log_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    # The ISO timestamp is only built when an entry is written out
+    if 'ts_ns' not in entry:
+        return entry
+    return {
+        'timestamp': _log_timestamp(entry),
+        'action': entry['action'],
+        'title': entry['title'],
+        'details': entry['details']
+    }
+
+
+def _read_file(path: str) -> bytes:
+    if path.endswith(ZSTD_SUFFIX):
+        # Streamed frames carry no content size, so decompress through a reader
+        with open(path, 'rb') as f:
+            with _require_zstd().ZstdDecompressor().stream_reader(f) as reader:
+                return reader.read()
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _loads(payload: bytes):
+    if orjson is not None:
+        return orjson.loads(payload)
+    if ujson is not None:
+        return ujson.loads(payload)
+    return json.loads(payload)
+
+
+if msgspec is not None:
+    # On-disk columnar layout; the summary keys in the file are ignored
+    class InventoryFile(msgspec.Struct):
+        titles: List[str]
+        authors: List[str]
+        prices: List[float]
+        stocks: List[int]
+        transaction_log: list = []
+
+    _inventory_decoder = msgspec.json.Decoder(InventoryFile)
+
+
+def _decode_inventory(payload: bytes) -> Dict[str, Any]:
+    if msgspec is not None:
+        # Parse and type-check the columns in one pass
+        try:
+            return msgspec.structs.asdict(_inventory_decoder.decode(payload))
+        except msgspec.ValidationError:
+            # Older per-book files do not match the schema
+            pass
+    return _loads(payload)
+
 class BookstoreInventory: 
     def __init__(self, json_file: str = 'books.json'):
         self.json_file = json_file
+        self.compressed_file = json_file if json_file.endswith(ZSTD_SUFFIX) else f"{json_file}{ZSTD_SUFFIX}"
+        self.save_file = self.compressed_file if zstd is not None else json_file
         self.books: Dict[str, Book] = {}
-        self.transaction_log = []
+        self.transaction_log = deque(maxlen=MAX_LOG_ENTRIES)
+        self.log_archive = f"{json_file}.log.jsonl"
+        self._log_overflow = []
+        self._dirty = False
+        # Casefolded "title\0author" search keys and a trigram -> titles index for find_book
+        self._search_text: Dict[str, str] = {}
+        self._trigram_index: Dict[str, set] = defaultdict(set)
+        # Prices and stocks as parallel columns (row per book), saved as-is
+        self._prices = array('d')
+        self._stocks = array('q')
+        self._row_titles: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        # Running price * stock total, adjusted by deltas as rows change
+        self._total_value = 0.0
         self.load_inventory()
     
-    def save_inventory(self) -> bool:
+    def _add_row(self, book: Book):
+        self._row_of[book.title] = len(self._row_titles)
+        self._row_titles.append(book.title)
+        self._prices.append(book.price)
+        self._stocks.append(book.stock)
+        self._total_value += book.price * book.stock
+    
+    def _remove_row(self, title: str):
+        # Swap the last row into the hole so the columns stay dense
+        row = self._row_of.pop(title)
+        self._total_value -= self._prices[row] * self._stocks[row]
+        last_title = self._row_titles.pop()
+        last_price = self._prices.pop()
+        last_stock = self._stocks.pop()
+        if last_title != title:
+            self._row_titles[row] = last_title
+            self._prices[row] = last_price
+            self._stocks[row] = last_stock
+            self._row_of[last_title] = row
+        if not self._row_titles:
+            self._total_value = 0.0
+    
+    def _index_book(self, book: Book):
+        title_lower = book.title.casefold()
+        author_lower = book.author.casefold()
+        # The NUL separator keeps a search term from matching across title and author
+        self._search_text[book.title] = f"{title_lower}\0{author_lower}"
+        for gram in _trigrams(title_lower) | _trigrams(author_lower):
+            self._trigram_index[gram].add(book.title)
+    
+    def _unindex_book(self, title: str):
+        title_lower, author_lower = self._search_text.pop(title).split('\0', 1)
+        for gram in _trigrams(title_lower) | _trigrams(author_lower):
+            titles = self._trigram_index[gram]
+            titles.discard(title)
+            if not titles:
+                del self._trigram_index[gram]
+    
+    def _latest_file(self) -> Optional[str]:
+        # Either file may exist after zstandard is installed or removed; the newer one wins
+        paths = [path for path in (self.compressed_file, self.json_file) if os.path.exists(path)]
+        return max(paths, key=os.path.getmtime) if paths else None
+    
+    def _archive_log_overflow(self):
+        if not self._log_overflow:
+            return
+        with open(self.log_archive, 'ab') as f:
+            for entry in self._log_overflow:
+                f.write(_encode_line(_stored_log_entry(entry)))
+        self._log_overflow = []
+    
+    def save_inventory(self, durable: bool = False) -> bool:
+        if not self._dirty:
+            print("💾 No changes to save")
+            return True
+        
         try:
+            self._archive_log_overflow()
             
-            if os.path.exists(self.json_file):
-                backup_file = f"{self.json_file}.backup"
-                os.rename(self.json_file, backup_file)
-            
-            data = {
-                'books': {title: book.to_dict() for title, book in self.books.items()},
-                'transaction_log': self.transaction_log,
-                'last_updated': datetime.now().isoformat(),
+            # Books are stored as parallel columns in row order
+            books = self.books
+            columns = {
+                'titles': self._row_titles,
+                'authors': (books[title].author for title in self._row_titles),
+                'prices': self._prices,
+                'stocks': self._stocks,
+                'transaction_log': map(_stored_log_entry, self.transaction_log),
+            }
+            fields = {
+                'last_updated': datetime.now(),
                 'total_books': len(self.books),
                 'total_inventory_value': self.calculate_total_inventory_value()
             }
             
-            with open(self.json_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            _stream_json(self.save_file, columns, fields, durable)
+            self._dirty = False
             
-            print(f"✅ Inventory saved to {self.json_file}")
+            print(f"✅ Inventory saved to {self.save_file}")
             return True
             
         except Exception as e:
@@ -39,17 +303,30 @@ class BookstoreInventory:
     
     def load_inventory(self) -> bool:
         try:
-            if os.path.exists(self.json_file):
-                with open(self.json_file, 'r') as f:
-                    data = json.load(f)
+            path = self._latest_file()
+            if path:
+                data = _decode_inventory(_read_file(path))
                 
-                books_data = data.get('books', {})
-                for title, book_data in books_data.items():
-                    self.books[title] = Book.from_dict(book_data)
+                if 'titles' in data:
+                    titles = data['titles']
+                    self.books = dict(zip(titles, map(Book, titles, data['authors'], data['prices'], data['stocks'])))
+                else:
+                    # Older files keep one dict per book; they are rewritten as columns on the next save
+                    books_data = data.get('books', {})
+                    self.books = {title: Book.from_dict(book_data) for title, book_data in books_data.items()}
+                for book in self.books.values():
+                    self._index_book(book)
+                    self._add_row(book)
+                # Start from an exact total rather than the row-by-row running sum
+                self._total_value = self._column_total()
                 
-                self.transaction_log = data.get('transaction_log', [])
+                entries = data.get('transaction_log', [])
+                self._log_overflow = entries[:-MAX_LOG_ENTRIES]
+                # Trimmed entries only reach the archive on the next save
+                self._dirty = bool(self._log_overflow) or 'titles' not in data
+                self.transaction_log = deque(entries, maxlen=MAX_LOG_ENTRIES)
                 
-                print(f"✅ Loaded {len(self.books)} books from {self.json_file}")
+                print(f"✅ Loaded {len(self.books)} books from {path}")
                 return True
             else:
                 print(f"📁 No existing inventory file. Starting fresh.")
@@ -67,6 +344,8 @@ class BookstoreInventory:
             return book.title
         
         self.books[book.title] = book
+        self._index_book(book)
+        self._add_row(book)
         
         self.log_transaction('ADD_BOOK', book.title, {
             'title': book.title,
@@ -78,17 +357,34 @@ class BookstoreInventory:
         print(f"✅ Added book: {book}")
         return book.title
     
+    def _term_candidates(self, term: str) -> set:
+        # Every trigram of the term must appear in a match; start from the rarest
+        postings = sorted((self._trigram_index.get(gram, set()) for gram in _trigrams(term)), key=len)
+        candidates = set(postings[0])
+        for titles in postings[1:]:
+            candidates &= titles
+            if not candidates:
+                break
+        return candidates
+    
     def find_book(self, search_term: str) -> List[Book]:
-        search_term = search_term.lower().strip()
-        results = []
+        # Multi-word terms match books containing every word, in title or author
+        terms = search_term.casefold().split()
         
-        for book in self.books.values():
-            if (search_term in book.title.lower() or 
-                search_term in book.author.lower() or 
-                search_term in book.title.lower()):
-                results.append(book)
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            if len(term) < 3:
+                continue
+            matches = self._term_candidates(term)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        if candidates is None:
+            candidates = self.books
         
-        return results
+        search_text = self._search_text
+        return [self.books[title] for title in sorted(candidates)
+                if all(term in search_text[title] for term in terms)]
     
     def get_book_by_title(self, title: str) -> Optional[Book]:
         return self.books.get(title)
@@ -101,6 +397,8 @@ class BookstoreInventory:
         
         old_stock = book.stock
         if book.update_stock(quantity_change):
+            self._stocks[self._row_of[title]] = book.stock
+            self._total_value += quantity_change * book.price
             self.log_transaction('STOCK_UPDATE', title, {
                 'old_stock': old_stock,
                 'new_stock': book.stock,
@@ -127,6 +425,8 @@ class BookstoreInventory:
         
         old_price = book.price
         book.update_price(new_price)
+        self._prices[self._row_of[title]] = book.price
+        self._total_value += (book.price - old_price) * book.stock
         
         self.log_transaction('PRICE_UPDATE', title, {
             'old_price': old_price,
@@ -143,7 +443,7 @@ class BookstoreInventory:
             return False
         
         if book.stock > 0:
-            confirm = input(f"⚠️  Book '{book.title}' has {book.stock} units in stock. Remove anyway? (y/N): ")
+            confirm = _prompt(f"⚠️  Book '{book.title}' has {book.stock} units in stock. Remove anyway? (y/N): ")
             if confirm.lower() != 'y':
                 print("❌ Operation cancelled")
                 return False
@@ -155,12 +455,27 @@ class BookstoreInventory:
         })
         
         del self.books[title]
+        self._unindex_book(title)
+        self._remove_row(title)
         print(f"✅ Removed book: {book.title}")
         return True
 
-    def log_transaction(self, action: str, title: str, details: Dict[str]):
+    def _column_total(self) -> float:
+        if np is not None:
+            prices = np.frombuffer(self._prices, dtype=np.float64)
+            stocks = np.frombuffer(self._stocks, dtype=np.int64)
+            return float(np.dot(prices, stocks))
+        return math.fsum(map(operator.mul, self._prices, self._stocks))
+    
+    def calculate_total_inventory_value(self) -> float:
+        return round(self._total_value, 2)
+    
+    def log_transaction(self, action: str, title: str, details: Dict[str, Any]):
+        self._dirty = True
+        if len(self.transaction_log) == self.transaction_log.maxlen:
+            self._log_overflow.append(self.transaction_log[0])
         self.transaction_log.append({
-            'timestamp': datetime.now().isoformat(),
+            'ts_ns': time.time_ns(),
             'action': action,
             'title': title,
             'details': details
@@ -171,38 +486,25 @@ class BookstoreInventory:
             print("📜 No transactions recorded")
             return
         
-        print(f"\n{'='*60}")
-        print(f"📜 RECENT TRANSACTIONS (Last {limit})")
-        print(f"{'='*60}")
+        lines = [
+            f"\n{'='*60}",
+            f"📜 RECENT TRANSACTIONS (Last {limit})",
+            f"{'='*60}",
+        ]
         
-        recent_transactions = self.transaction_log[-limit:]
-        for i, transaction in enumerate(reversed(recent_transactions), 1):
-            timestamp = transaction['timestamp']
+        recent_transactions = islice(reversed(self.transaction_log), limit)
+        for i, transaction in enumerate(recent_transactions, 1):
             action = transaction['action']
-            title = transaction['title']
-            details = transaction['details']
-            
-            print(f"{i}. {timestamp}")
-            print(f"   Action: {action}")
-            print(f"   title: {title}")
+            lines.append(f"{i}. {_log_timestamp(transaction)}\n   Action: {action}\n   title: {transaction['title']}")
             
-            if action == 'ADD_BOOK':
-                print(f"   Added: '{details['title']}' by {details['author']}")
-                print(f"   Price: ${details['price']:.2f}, Initial Stock: {details['initial_stock']}")
+            detail_format = LOG_DETAIL_FORMATS.get(action)
+            if detail_format:
+                lines.append(detail_format.format_map(transaction['details']))
             
-            elif action == 'STOCK_UPDATE':
-                print(f"   Stock: {details['old_stock']} → {details['new_stock']} ({details['change']:+d})")
-                print(f"   Reason: {details['reason']}")
-            
-            elif action == 'PRICE_UPDATE':
-                print(f"   Price: ${details['old_price']:.2f} → ${details['new_price']:.2f}")
-            
-            elif action == 'REMOVE_BOOK':
-                print(f"   Removed: '{details['title']}'")
-            
-            print()
+            lines.append("")
         
-        print(f"{'='*60}\n")
+        lines.append(f"{'='*60}\n")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     inventory = BookstoreInventory()
@@ -212,40 +514,19 @@ def main():
     
     while True:
         try:
-            command = input("📖 Enter command: ").strip().lower()
-            
-            if command in ['quit', 'exit']:
-                inventory.save_inventory()
+            command = _prompt("📖 Enter command: ").strip().lower()
+        except EOFError:
+            # End of a scripted command stream behaves like 'quit'
+            command = 'quit'
+        
+        try:
+            handler = HANDLERS.get(command)
+            if handler:
+                handler(inventory)
+            elif command in ('quit', 'exit'):
+                inventory.save_inventory(durable=True)
                 print("👋 Goodbye!")
                 break
-            
-            elif command == 'add':
-                add_book_interactive(inventory)
-            
-            elif command == 'search':
-                search_books_interactive(inventory)
-            
-            elif command == 'stock':
-                update_stock_interactive(inventory)
-            
-            elif command == 'sell':
-                sell_book_interactive(inventory)
-            
-            elif command == 'restock':
-                restock_book_interactive(inventory)
-            
-            elif command == 'price':
-                update_price_interactive(inventory)
-            
-            elif command == 'remove':
-                remove_book_interactive(inventory)
-            
-            elif command == 'list':
-                list_all_books(inventory)
-            
-            elif command == 'save':
-                inventory.save_inventory()
-            
             else:
                 print("❌ Unknown command")
         except Exception as e:
@@ -253,22 +534,22 @@ def main():
 
 def add_book_interactive(inventory: BookstoreInventory):
     try:
-        title = input("Enter book title: ").strip()
+        title = _prompt("Enter book title: ").strip()
         if not title:
             print("❌ Title cannot be empty")
             return
         
-        author = input("Enter author name: ").strip()
+        author = _prompt("Enter author name: ").strip()
         if not author:
             print("❌ Author cannot be empty")
             return
         
-        price = float(input("Enter price: $"))
+        price = float(_prompt("Enter price: $"))
         if price < 0:
             print("❌ Price cannot be negative")
             return
         
-        stock = int(input("Enter initial stock (default 0): ") or "0")
+        stock = int(_prompt("Enter initial stock (default 0): ") or "0")
         if stock < 0:
             print("❌ Stock cannot be negative")
             return
@@ -280,7 +561,7 @@ def add_book_interactive(inventory: BookstoreInventory):
 
 
 def search_books_interactive(inventory: BookstoreInventory):
-    search_term = input("Enter search term (title, author, or title): ").strip()
+    search_term = _prompt("Enter search term (title or author): ").strip()
     if not search_term:
         print("❌ Search term cannot be empty")
         return
@@ -308,7 +589,7 @@ def search_books_interactive(inventory: BookstoreInventory):
 
 
 def update_stock_interactive(inventory: BookstoreInventory):
-    title = input("Enter book title: ").strip()
+    title = _prompt("Enter book title: ").strip()
     if not title:
         print("❌ title cannot be empty")
         return
@@ -321,28 +602,28 @@ def update_stock_interactive(inventory: BookstoreInventory):
     print(f"Current stock for '{book.title}': {book.stock}")
     
     try:
-        change = int(input("Enter stock change (+/- amount): "))
-        reason = input("Enter reason (optional): ").strip() or "Manual Update"
+        change = int(_prompt("Enter stock change (+/- amount): "))
+        reason = _prompt("Enter reason (optional): ").strip() or "Manual Update"
         inventory.update_stock(title, change, reason)
     except ValueError:
         print("❌ Invalid quantity")
 
 
 def sell_book_interactive(inventory: BookstoreInventory):
-    title = input("Enter book title: ").strip()
+    title = _prompt("Enter book title: ").strip()
     if not title:
         print("❌ title cannot be empty")
         return
     
     try:
-        quantity = int(input("Enter quantity to sell (default 1): ") or "1")
+        quantity = int(_prompt("Enter quantity to sell (default 1): ") or "1")
         if quantity <= 0:
             print("❌ Quantity must be positive")
             return
         
         if inventory.sell_book(title, quantity):
             book = inventory.get_book_by_title(title)
-            total_sale = math.ceil(book.price * quantity * 100) / 100
+            total_sale = round(book.price * quantity, 2)
             print(f"💰 Sale completed! Total: ${total_sale:.2f}")
         
     except ValueError:
@@ -350,13 +631,13 @@ def sell_book_interactive(inventory: BookstoreInventory):
 
 
 def restock_book_interactive(inventory: BookstoreInventory):
-    title = input("Enter book title: ").strip()
+    title = _prompt("Enter book title: ").strip()
     if not title:
         print("❌ title cannot be empty")
         return
     
     try:
-        quantity = int(input("Enter quantity to add: "))
+        quantity = int(_prompt("Enter quantity to add: "))
         if quantity <= 0:
             print("❌ Quantity must be positive")
             return
@@ -368,7 +649,7 @@ def restock_book_interactive(inventory: BookstoreInventory):
 
 
 def update_price_interactive(inventory: BookstoreInventory):
-    title = input("Enter book title: ").strip()
+    title = _prompt("Enter book title: ").strip()
     if not title:
         print("❌ title cannot be empty")
         return
@@ -381,7 +662,7 @@ def update_price_interactive(inventory: BookstoreInventory):
     print(f"Current price for '{book.title}': ${book.price:.2f}")
     
     try:
-        new_price = float(input("Enter new price: $"))
+        new_price = float(_prompt("Enter new price: $"))
         if new_price < 0:
             print("❌ Price cannot be negative")
             return
@@ -393,7 +674,7 @@ def update_price_interactive(inventory: BookstoreInventory):
 
 
 def remove_book_interactive(inventory: BookstoreInventory):
-    title = input("Enter book title: ").strip()
+    title = _prompt("Enter book title: ").strip()
     if not title:
         print("❌ title cannot be empty")
         return
@@ -408,24 +689,42 @@ def list_all_books(inventory: BookstoreInventory):
     
     books = sorted(inventory.books.values(), key=lambda x: x.title)
     
-    print(f"\n{'='*100}")
-    print(f"📚 ALL BOOKS IN INVENTORY ({len(books)} books)")
-    print(f"{'='*100}")
-    print(f"{'Title':<30} {'Author':<20} {'Price':<10} {'Stock':<8} {'Value':<10} {'Status':<12}")
-    print(f"{'-'*100}")
+    rows = [
+        f"\n{'='*100}",
+        f"📚 ALL BOOKS IN INVENTORY ({len(books)} books)",
+        f"{'='*100}",
+        f"{'Title':<30} {'Author':<20} {'Price':<10} {'Stock':<8} {'Value':<10} {'Status':<12}",
+        f"{'-'*100}",
+    ]
     
     for book in books:
-        value = book.calculate_value()
-        status = "In Stock" if book.is_in_stock() else "Out of Stock"
+        price = book.price
+        stock = book.stock
+        value = round(price * stock, 2)
         if book.is_low_stock():
             status = "Low Stock"
+        else:
+            status = "In Stock" if stock > 0 else "Out of Stock"
         
         title = book.title[:28] + "..." if len(book.title) > 30 else book.title
         author = book.author[:18] + "..." if len(book.author) > 20 else book.author
         
-        print(f"{title:<30} {author:<20} ${book.price:<9.2f} {book.stock:<8} ${value:<9.2f} {status:<12}")
+        rows.append(f"{title:<30} {author:<20} ${price:<9.2f} {stock:<8} ${value:<9.2f} {status:<12}")
     
-    print(f"{'='*100}\n")
+    rows.append(f"{'='*100}\n")
+    sys.stdout.write("\n".join(rows) + "\n")
+
+HANDLERS = {
+    'add': add_book_interactive,
+    'search': search_books_interactive,
+    'stock': update_stock_interactive,
+    'sell': sell_book_interactive,
+    'restock': restock_book_interactive,
+    'price': update_price_interactive,
+    'remove': remove_book_interactive,
+    'list': list_all_books,
+    'save': lambda inventory: inventory.save_inventory(durable=True),
+}
 
 if __name__ == "__main__":
     main()
\ No newline at end of file